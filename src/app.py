@@ -5,22 +5,20 @@ A super simple FastAPI application that allows students to view and sign up
 for extracurricular activities at Mergington High School.
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import APIRouter, FastAPI, HTTPException, Request, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import RedirectResponse
+from typing import Literal
+from pydantic import BaseModel, TypeAdapter, field_validator
 import os
+import sys
+import uuid
 from pathlib import Path
 
-app = FastAPI(title="Mergington High School API",
-              description="API for viewing and signing up for extracurricular activities")
+router = APIRouter()
 
-# Mount the static files directory
-current_dir = Path(__file__).parent
-app.mount("/static", StaticFiles(directory=os.path.join(Path(__file__).parent,
-          "static")), name="static")
-
-# In-memory activity database
-activities = {
+# Initial contents of the in-memory activity database
+DEFAULT_ACTIVITIES = {
     "Chess Club": {
         "description": "Learn strategies and compete in chess tournaments",
         "schedule": "Fridays, 3:30 PM - 5:00 PM",
@@ -81,19 +79,102 @@ activities = {
 }
 
 
-@app.get("/")
+class Activity(BaseModel):
+    """Response model for a single activity"""
+    description: str
+    schedule: str
+    max_participants: int
+    participants: list[str]
+
+    @field_validator("participants", mode="before")
+    @classmethod
+    def sort_participants(cls, participants):
+        # Participants are stored as a set; emit them in a stable order
+        return sorted(participants)
+
+
+activities_adapter = TypeAdapter(dict[str, Activity])
+
+
+class ParticipantOperation(BaseModel):
+    """A single signup or unregistration in a bulk request"""
+    activity: str
+    email: str
+    op: Literal["signup", "unregister"]
+
+
+def copy_activities(activities):
+    """Copy an activity database, storing each participant list as a set"""
+    # Only the participant containers are copied; the other fields are shared.
+    # Emails are interned so lookups of the same address hit by identity.
+    return {
+        name: {**activity, "participants": {sys.intern(email) for email in activity["participants"]}}
+        for name, activity in activities.items()
+    }
+
+
+def default_activities():
+    """Build a fresh activity database from the default activities"""
+    return copy_activities(DEFAULT_ACTIVITIES)
+
+
+def reset_state(state):
+    """Restore an app's activity database to the defaults"""
+    state.activities.clear()
+    state.activities.update(default_activities())
+    mark_activities_changed(state)
+
+
+def etag_matches(if_none_match, etag):
+    """Check an If-None-Match header against an ETag using weak comparison"""
+    if if_none_match is None:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (candidate.strip() for candidate in if_none_match.split(","))
+    return any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+def mark_activities_changed(state):
+    """Invalidate ETags and the cached payload for the current activities state"""
+    state.activities_version += 1
+
+
+@router.get("/")
 def root():
     return RedirectResponse(url="/static/index.html")
 
 
-@app.get("/activities")
-def get_activities():
-    return activities
+# Handlers that touch app.state are async def without any awaits, so they run
+# one at a time on the event loop. As plain def they would run concurrently in
+# the threadpool and could iterate a participant set while another request
+# changes it.
+@router.get("/activities")
+async def get_activities(request: Request) -> dict[str, Activity]:
+    state = request.app.state
+    # Read the version once so the ETag and the cache key always agree, even
+    # if the activities change while this request is serializing them
+    version = state.activities_version
+    etag = f'"{state.boot_id}-{version}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
 
+    # Client already has the current state, skip serializing it again
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
 
-@app.post("/activities/{activity_name}/signup")
-def signup_for_activity(activity_name: str, email: str):
-    """Sign up a student for an activity"""
+    # Serialize once per version and reuse the bytes until the next change
+    cache = state.activities_cache
+    if cache is not None and cache[0] == version:
+        content = cache[1]
+    else:
+        payload = activities_adapter.validate_python(state.activities)
+        content = activities_adapter.dump_json(payload)
+        state.activities_cache = (version, content)
+    return Response(content=content, media_type="application/json", headers=headers)
+
+
+def add_participant(activities, activity_name, email):
+    """Add a student to an activity, raising HTTPException if not allowed"""
     # Validate activity exists
     if activity_name not in activities:
         raise HTTPException(status_code=404, detail="Activity not found")
@@ -106,13 +187,11 @@ def signup_for_activity(activity_name: str, email: str):
         raise HTTPException(status_code=400, detail="Student is already signed up for this activity")
 
     # Add student
-    activity["participants"].append(email)
-    return {"message": f"Signed up {email} for {activity_name}"}
+    activity["participants"].add(email)
 
 
-@app.delete("/activities/{activity_name}/unregister")
-def unregister_from_activity(activity_name: str, email: str):
-    """Unregister a student from an activity"""
+def remove_participant(activities, activity_name, email):
+    """Remove a student from an activity, raising HTTPException if not allowed"""
     # Validate activity exists
     if activity_name not in activities:
         raise HTTPException(status_code=404, detail="Activity not found")
@@ -126,4 +205,85 @@ def unregister_from_activity(activity_name: str, email: str):
 
     # Remove student
     activity["participants"].remove(email)
+
+
+@router.post("/activities/{activity_name}/signup")
+async def signup_for_activity(request: Request, activity_name: str, email: str):
+    """Sign up a student for an activity"""
+    email = sys.intern(email)
+    state = request.app.state
+    add_participant(state.activities, activity_name, email)
+    mark_activities_changed(state)
+    return {"message": f"Signed up {email} for {activity_name}"}
+
+
+@router.delete("/activities/{activity_name}/unregister")
+async def unregister_from_activity(request: Request, activity_name: str, email: str):
+    """Unregister a student from an activity"""
+    email = sys.intern(email)
+    state = request.app.state
+    remove_participant(state.activities, activity_name, email)
+    mark_activities_changed(state)
     return {"message": f"Unregistered {email} from {activity_name}"}
+
+
+@router.post("/activities/bulk")
+async def bulk_update_activities(request: Request, operations: list[ParticipantOperation]):
+    """Apply several signups/unregistrations in order, all or nothing"""
+    # No awaits below: the whole batch, including any rollback, runs without
+    # another request touching the activities in between
+    state = request.app.state
+    activities = state.activities
+    applied = []
+
+    try:
+        for operation in operations:
+            email = sys.intern(operation.email)
+            if operation.op == "signup":
+                add_participant(activities, operation.activity, email)
+            else:
+                remove_participant(activities, operation.activity, email)
+            applied.append((operation, email))
+    except HTTPException:
+        # Undo the operations that already succeeded before reporting the error
+        for operation, email in reversed(applied):
+            participants = activities[operation.activity]["participants"]
+            if operation.op == "signup":
+                participants.remove(email)
+            else:
+                participants.add(email)
+        raise
+
+    if applied:
+        mark_activities_changed(state)
+    return {"applied": len(applied)}
+
+
+def create_app(state=None):
+    """Build the API around an activity database (a fresh default copy if omitted)
+
+    An injected database uses the same shape as DEFAULT_ACTIVITIES. The app
+    works on its own copy, so the caller's dict is never modified.
+    """
+    app = FastAPI(title="Mergington High School API",
+                  description="API for viewing and signing up for extracurricular activities")
+
+    # In-memory activity database
+    app.state.activities = default_activities() if state is None else copy_activities(state)
+    # Incremented on every change to the activities; together with the per-app
+    # boot id it forms the ETag for GET /activities, so ETags from before a
+    # restart never match
+    app.state.boot_id = uuid.uuid4().hex
+    app.state.activities_version = 0
+    # (version, bytes) of the last serialized GET /activities payload
+    app.state.activities_cache = None
+
+    # Mount the static files directory
+    app.mount("/static", StaticFiles(directory=os.path.join(Path(__file__).parent,
+              "static")), name="static")
+    app.include_router(router)
+    return app
+
+
+app = create_app()
+activities = app.state.activities
@@ -1,88 +1,52 @@
 """Pytest configuration and fixtures"""
 import pytest
-from fastapi.testclient import TestClient
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
 import sys
 from pathlib import Path
 
 # Add src directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from app import app, activities
+from app import create_app, reset_state
 
+# One app per process; under pytest-xdist (-n auto) each worker gets its own
+test_app = create_app()
 
-@pytest.fixture
-def client():
-    """Create a test client for the FastAPI app"""
-    return TestClient(app)
+
+@pytest_asyncio.fixture(scope="session")
+async def client():
+    """Create a single async client for the FastAPI app, shared by all tests"""
+    transport = ASGITransport(app=test_app)
+    async with AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
 
 
 @pytest.fixture(autouse=True)
 def reset_activities():
     """Reset activities to initial state before each test"""
-    # Store initial state
-    initial_activities = {
-        "Chess Club": {
-            "description": "Learn strategies and compete in chess tournaments",
-            "schedule": "Fridays, 3:30 PM - 5:00 PM",
-            "max_participants": 12,
-            "participants": ["michael@mergington.edu", "daniel@mergington.edu"]
-        },
-        "Programming Class": {
-            "description": "Learn programming fundamentals and build software projects",
-            "schedule": "Tuesdays and Thursdays, 3:30 PM - 4:30 PM",
-            "max_participants": 20,
-            "participants": ["emma@mergington.edu", "sophia@mergington.edu"]
-        },
-        "Gym Class": {
-            "description": "Physical education and sports activities",
-            "schedule": "Mondays, Wednesdays, Fridays, 2:00 PM - 3:00 PM",
-            "max_participants": 30,
-            "participants": ["john@mergington.edu", "olivia@mergington.edu"]
-        },
-        "Soccer Team": {
-            "description": "Join the school soccer team and compete in local leagues",
-            "schedule": "Tuesdays and Thursdays, 4:00 PM - 5:30 PM",
-            "max_participants": 18,
-            "participants": ["lucas@mergington.edu", "mia@mergington.edu"]
-        },
-        "Basketball Club": {
-            "description": "Practice basketball skills and play friendly matches",
-            "schedule": "Wednesdays, 3:30 PM - 5:00 PM",
-            "max_participants": 15,
-            "participants": ["liam@mergington.edu", "ava@mergington.edu"]
-        },
-        "Art Club": {
-            "description": "Explore painting, drawing, and other visual arts",
-            "schedule": "Mondays, 3:30 PM - 5:00 PM",
-            "max_participants": 16,
-            "participants": ["ella@mergington.edu", "noah@mergington.edu"]
-        },
-        "Drama Society": {
-            "description": "Participate in school plays and drama workshops",
-            "schedule": "Thursdays, 4:00 PM - 5:30 PM",
-            "max_participants": 20,
-            "participants": ["amelia@mergington.edu", "jack@mergington.edu"]
-        },
-        "Math Olympiad": {
-            "description": "Prepare for math competitions and solve challenging problems",
-            "schedule": "Fridays, 2:00 PM - 3:30 PM",
-            "max_participants": 10,
-            "participants": ["ethan@mergington.edu", "isabella@mergington.edu"]
-        },
-        "Science Club": {
-            "description": "Conduct experiments and explore scientific concepts",
-            "schedule": "Wednesdays, 4:00 PM - 5:00 PM",
-            "max_participants": 14,
-            "participants": ["benjamin@mergington.edu", "charlotte@mergington.edu"]
-        }
-    }
-    
-    # Reset activities before each test
-    activities.clear()
-    activities.update(initial_activities)
-    
+    reset_state(test_app.state)
     yield
-    
-    # Clean up after test (optional, but good practice)
-    activities.clear()
-    activities.update(initial_activities)
+
+
+@pytest.fixture
+def app_state():
+    """Expose the test app's state (database, ETag version and payload cache)"""
+    return test_app.state
+
+
+@pytest.fixture
+def activities_state():
+    """Expose the in-memory activity database for direct state assertions"""
+    return test_app.state.activities
+
+
+@pytest.fixture(scope="session")
+def fetch_activities(client):
+    """Send a GET /activities request that is built once and reused by every test"""
+    request = client.build_request("GET", "/activities")
+
+    async def _call():
+        return await client.send(request)
+
+    return _call
@@ -1,25 +1,81 @@
 """Tests for the Mergington High School API endpoints"""
+import asyncio
+import copy
 import pytest
-from fastapi import status
+from httpx import ASGITransport, AsyncClient
+import app as app_module
+from app import DEFAULT_ACTIVITIES, app, create_app, reset_state, root
+
+# URL templates for the participant endpoints; emails are sent as query params
+SIGNUP = "/activities/{activity}/signup"
+UNREGISTER = "/activities/{activity}/unregister"
 
 
 class TestRootEndpoint:
     """Tests for the root endpoint"""
     
-    def test_root_redirects_to_static_index(self, client):
+    def test_root_redirects_to_static_index(self):
         """Test that root endpoint redirects to static/index.html"""
-        response = client.get("/", follow_redirects=False)
-        assert response.status_code == status.HTTP_307_TEMPORARY_REDIRECT
+        # Check the app-level route wiring (url_path_for resolves through
+        # included routers), then call the endpoint without an HTTP round trip
+        assert app.url_path_for(root.__name__) == "/"
+        assert "get" in app.openapi()["paths"]["/"]
+        
+        response = root()
+        assert response.status_code == 307
         assert response.headers["location"] == "/static/index.html"
 
 
+class TestCreateApp:
+    """Tests for building the app around an injected activity database"""
+    
+    async def test_injected_list_participants_support_signup(self):
+        """Test that participant lists in an injected database are usable"""
+        state = {
+            "Robotics Club": {
+                "description": "Build and program robots",
+                "schedule": "Mondays, 4:00 PM - 5:00 PM",
+                "max_participants": 8,
+                "participants": ["existing@mergington.edu"]
+            }
+        }
+        app = create_app(state)
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post(
+                SIGNUP.format(activity="Robotics Club"), params={"email": "new@mergington.edu"}
+            )
+            assert response.status_code == 200
+            
+            response = await client.post(
+                SIGNUP.format(activity="Robotics Club"), params={"email": "existing@mergington.edu"}
+            )
+            assert response.status_code == 400
+        
+        assert app.state.activities["Robotics Club"]["participants"] == {
+            "existing@mergington.edu",
+            "new@mergington.edu",
+        }
+        # The caller's database is left untouched
+        assert state["Robotics Club"]["participants"] == ["existing@mergington.edu"]
+    
+    def test_injecting_defaults_does_not_modify_them(self):
+        """Test that create_app and reset_state never modify DEFAULT_ACTIVITIES"""
+        defaults = copy.deepcopy(DEFAULT_ACTIVITIES)
+        app = create_app(DEFAULT_ACTIVITIES)
+        reset_state(app.state)
+        
+        assert DEFAULT_ACTIVITIES == defaults
+        assert app.state.activities.keys() == DEFAULT_ACTIVITIES.keys()
+
+
 class TestGetActivities:
     """Tests for GET /activities endpoint"""
     
-    def test_get_activities_returns_all_activities(self, client):
+    async def test_get_activities_returns_all_activities(self, fetch_activities):
         """Test that GET /activities returns all available activities"""
-        response = client.get("/activities")
-        assert response.status_code == status.HTTP_200_OK
+        response = await fetch_activities()
+        assert response.status_code == 200
         
         data = response.json()
         assert isinstance(data, dict)
@@ -30,9 +86,9 @@ class TestGetActivities:
         assert "Programming Class" in data
         assert "Soccer Team" in data
     
-    def test_activities_have_required_fields(self, client):
+    async def test_activities_have_required_fields(self, fetch_activities):
         """Test that all activities have required fields"""
-        response = client.get("/activities")
+        response = await fetch_activities()
         data = response.json()
         
         for activity_name, activity_data in data.items():
@@ -43,209 +99,377 @@ class TestGetActivities:
             assert isinstance(activity_data["participants"], list)
             assert isinstance(activity_data["max_participants"], int)
     
-    def test_chess_club_initial_participants(self, client):
+    async def test_chess_club_initial_participants(self, fetch_activities):
         """Test Chess Club has correct initial participants"""
-        response = client.get("/activities")
+        response = await fetch_activities()
         data = response.json()
         
         chess_club = data["Chess Club"]
         assert len(chess_club["participants"]) == 2
         assert "michael@mergington.edu" in chess_club["participants"]
         assert "daniel@mergington.edu" in chess_club["participants"]
+    
+    async def test_participants_returned_as_sorted_list(self, client, fetch_activities):
+        """Test participants are serialized as a sorted list"""
+        await client.post(
+            SIGNUP.format(activity="Chess Club"), params={"email": "anna@mergington.edu"}
+        )
+        response = await fetch_activities()
+        data = response.json()
+        
+        assert data["Chess Club"]["participants"] == [
+            "anna@mergington.edu",
+            "daniel@mergington.edu",
+            "michael@mergington.edu",
+        ]
 
 
-class TestSignupEndpoint:
-    """Tests for POST /activities/{activity_name}/signup endpoint"""
+class TestActivitiesETag:
+    """Tests for conditional GET /activities requests"""
     
-    def test_signup_new_participant_success(self, client):
-        """Test successful signup of a new participant"""
-        response = client.post(
-            "/activities/Chess Club/signup?email=newstudent@mergington.edu"
-        )
-        assert response.status_code == status.HTTP_200_OK
+    async def test_get_activities_returns_etag(self, fetch_activities):
+        """Test that GET /activities includes an ETag header"""
+        response = await fetch_activities()
+        assert response.status_code == 200
+        assert "etag" in response.headers
+    
+    async def test_matching_etag_returns_not_modified(self, client, fetch_activities):
+        """Test that a matching If-None-Match returns 304 without a body"""
+        etag = (await fetch_activities()).headers["etag"]
         
-        data = response.json()
-        assert data["message"] == "Signed up newstudent@mergington.edu for Chess Club"
+        response = await client.get("/activities", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag
+        assert response.content == b""
+    
+    async def test_weak_etag_returns_not_modified(self, client, fetch_activities):
+        """Test that a weak W/ form of the current ETag still returns 304"""
+        etag = (await fetch_activities()).headers["etag"]
         
-        # Verify participant was added
-        activities_response = client.get("/activities")
-        activities_data = activities_response.json()
-        assert "newstudent@mergington.edu" in activities_data["Chess Club"]["participants"]
-    
-    def test_signup_already_registered_participant(self, client):
-        """Test signup fails when participant is already registered"""
-        # Try to sign up a participant who is already registered
-        response = client.post(
-            "/activities/Chess Club/signup?email=michael@mergington.edu"
+        response = await client.get("/activities", headers={"If-None-Match": f"W/{etag}"})
+        assert response.status_code == 304
+    
+    async def test_etag_list_returns_not_modified(self, client, fetch_activities):
+        """Test that a list of ETags containing the current one returns 304"""
+        etag = (await fetch_activities()).headers["etag"]
+        
+        response = await client.get(
+            "/activities", headers={"If-None-Match": f'"stale-1", W/"stale-2", {etag}'}
+        )
+        assert response.status_code == 304
+        
+        response = await client.get(
+            "/activities", headers={"If-None-Match": '"stale-1", W/"stale-2"'}
         )
-        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.status_code == 200
+    
+    async def test_wildcard_etag_returns_not_modified(self, client):
+        """Test that If-None-Match: * returns 304"""
+        response = await client.get("/activities", headers={"If-None-Match": "*"})
+        assert response.status_code == 304
+    
+    async def test_etag_changes_after_signup(self, client, fetch_activities, activities_state):
+        """Test that a stale ETag gets the updated activities after signup"""
+        email = "etag@mergington.edu"
+        etag = (await fetch_activities()).headers["etag"]
+        
+        await client.post(SIGNUP.format(activity="Chess Club"), params={"email": email})
+        response = await client.get("/activities", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
         
         data = response.json()
-        assert data["detail"] == "Student is already signed up for this activity"
+        assert email in data["Chess Club"]["participants"]
+        assert email in activities_state["Chess Club"]["participants"]
     
-    def test_signup_nonexistent_activity(self, client):
-        """Test signup fails for non-existent activity"""
-        response = client.post(
-            "/activities/Nonexistent Club/signup?email=student@mergington.edu"
+    async def test_etag_changes_after_unregister(self, client, fetch_activities):
+        """Test that unregistering invalidates the previous ETag"""
+        etag = (await fetch_activities()).headers["etag"]
+        
+        await client.delete(
+            UNREGISTER.format(activity="Chess Club"), params={"email": "michael@mergington.edu"}
         )
-        assert response.status_code == status.HTTP_404_NOT_FOUND
+        response = await client.get("/activities", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+    
+    async def test_change_during_serialization_is_not_cached(self, fetch_activities, app_state,
+                                                             monkeypatch):
+        """Test a signup that lands mid-serialization shows up on the next GET"""
+        email = "late@mergington.edu"
+        validate_python = app_module.activities_adapter.validate_python
         
-        data = response.json()
-        assert data["detail"] == "Activity not found"
+        def validate_then_signup(activities):
+            # Snapshot the payload first, then mutate before it is cached
+            payload = validate_python(activities)
+            monkeypatch.setattr(app_module.activities_adapter, "validate_python", validate_python)
+            activities["Chess Club"]["participants"].add(email)
+            app_module.mark_activities_changed(app_state)
+            return payload
+        
+        monkeypatch.setattr(app_module.activities_adapter, "validate_python", validate_then_signup)
+        stale = await fetch_activities()
+        assert email not in stale.json()["Chess Club"]["participants"]
+        
+        response = await fetch_activities()
+        assert response.headers["etag"] != stale.headers["etag"]
+        assert email in response.json()["Chess Club"]["participants"]
+        assert email in app_state.activities["Chess Club"]["participants"]
+    
+    async def test_etag_differs_between_app_instances(self):
+        """Test that a restarted app never reuses an ETag from a previous run"""
+        etags = []
+        for _ in range(2):
+            transport = ASGITransport(app=create_app())
+            async with AsyncClient(transport=transport, base_url="http://test") as client:
+                response = await client.get("/activities")
+                etags.append(response.headers["etag"])
+        
+        assert etags[0] != etags[1]
+
+
+class TestSignupEndpoint:
+    """Tests for POST /activities/{activity_name}/signup endpoint"""
     
-    def test_signup_with_url_encoded_activity_name(self, client):
-        """Test signup works with URL-encoded activity names"""
-        response = client.post(
-            "/activities/Programming%20Class/signup?email=newcoder@mergington.edu"
+    async def test_signup_new_participant_success(self, client, activities_state):
+        """Test successful signup of a new participant"""
+        response = await client.post(
+            SIGNUP.format(activity="Chess Club"), params={"email": "newstudent@mergington.edu"}
         )
-        assert response.status_code == status.HTTP_200_OK
+        assert response.status_code == 200
+        
+        data = response.json()
+        assert data["message"] == "Signed up newstudent@mergington.edu for Chess Club"
         
         # Verify participant was added
-        activities_response = client.get("/activities")
-        activities_data = activities_response.json()
-        assert "newcoder@mergington.edu" in activities_data["Programming Class"]["participants"]
+        assert "newstudent@mergington.edu" in activities_state["Chess Club"]["participants"]
     
-    def test_signup_multiple_activities_same_user(self, client):
+    async def test_signup_multiple_activities_same_user(self, client, activities_state):
         """Test that same user can sign up for multiple activities"""
         email = "multisport@mergington.edu"
         
-        # Sign up for Chess Club
-        response1 = client.post(f"/activities/Chess Club/signup?email={email}")
-        assert response1.status_code == status.HTTP_200_OK
+        # Set up: already signed up for Chess Club and Basketball Club
+        setup_response = await client.post("/activities/bulk", json=[
+            {"activity": "Chess Club", "email": email, "op": "signup"},
+            {"activity": "Basketball Club", "email": email, "op": "signup"},
+        ])
+        assert setup_response.status_code == 200
         
         # Sign up for Soccer Team
-        response2 = client.post(f"/activities/Soccer Team/signup?email={email}")
-        assert response2.status_code == status.HTTP_200_OK
+        response = await client.post(SIGNUP.format(activity="Soccer Team"), params={"email": email})
+        assert response.status_code == 200
         
-        # Verify user is in both activities
-        activities_response = client.get("/activities")
-        activities_data = activities_response.json()
-        assert email in activities_data["Chess Club"]["participants"]
-        assert email in activities_data["Soccer Team"]["participants"]
+        # Verify user is in all three activities
+        assert email in activities_state["Chess Club"]["participants"]
+        assert email in activities_state["Basketball Club"]["participants"]
+        assert email in activities_state["Soccer Team"]["participants"]
 
 
 class TestUnregisterEndpoint:
     """Tests for DELETE /activities/{activity_name}/unregister endpoint"""
     
-    def test_unregister_existing_participant_success(self, client):
+    async def test_unregister_existing_participant_success(self, client, activities_state):
         """Test successful unregistration of an existing participant"""
-        response = client.delete(
-            "/activities/Chess Club/unregister?email=michael@mergington.edu"
+        response = await client.delete(
+            UNREGISTER.format(activity="Chess Club"), params={"email": "michael@mergington.edu"}
         )
-        assert response.status_code == status.HTTP_200_OK
+        assert response.status_code == 200
         
         data = response.json()
         assert data["message"] == "Unregistered michael@mergington.edu from Chess Club"
         
         # Verify participant was removed
-        activities_response = client.get("/activities")
-        activities_data = activities_response.json()
-        assert "michael@mergington.edu" not in activities_data["Chess Club"]["participants"]
+        assert "michael@mergington.edu" not in activities_state["Chess Club"]["participants"]
         # But daniel should still be there
-        assert "daniel@mergington.edu" in activities_data["Chess Club"]["participants"]
+        assert "daniel@mergington.edu" in activities_state["Chess Club"]["participants"]
+
+
+class TestUrlEncodedActivityName:
+    """Tests for signup/unregister with URL-encoded activity names"""
     
-    def test_unregister_not_registered_participant(self, client):
-        """Test unregister fails when participant is not registered"""
-        response = client.delete(
-            "/activities/Chess Club/unregister?email=notregistered@mergington.edu"
+    @pytest.mark.parametrize("method,suffix,email,registered", [
+        ("post", "signup", "newcoder@mergington.edu", True),
+        ("delete", "unregister", "emma@mergington.edu", False),
+    ])
+    async def test_url_encoded_activity_name(self, client, activities_state,
+                                             method, suffix, email, registered):
+        """Test signup/unregister work with URL-encoded activity names"""
+        response = await getattr(client, method)(
+            f"/activities/Programming%20Class/{suffix}?email={email}"
         )
-        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.status_code == 200
+        
+        # Verify participant was added or removed
+        assert (email in activities_state["Programming Class"]["participants"]) == registered
+
+
+class TestErrorResponses:
+    """Tests for signup and unregister error responses"""
+    
+    @pytest.mark.parametrize("method,url,expected_status,expected_detail", [
+        # Signup fails for non-existent activity
+        ("POST", "/activities/Nonexistent Club/signup?email=student@mergington.edu",
+         404, "Activity not found"),
+        # Unregister fails for non-existent activity
+        ("DELETE", "/activities/Nonexistent Club/unregister?email=student@mergington.edu",
+         404, "Activity not found"),
+        # Signup fails when participant is already registered
+        ("POST", "/activities/Chess Club/signup?email=michael@mergington.edu",
+         400, "Student is already signed up for this activity"),
+        # Unregister fails when participant is not registered
+        ("DELETE", "/activities/Chess Club/unregister?email=notregistered@mergington.edu",
+         400, "Student is not signed up for this activity"),
+    ])
+    async def test_error_response(self, client, method, url, expected_status, expected_detail):
+        """Test signup/unregister return the expected error status and detail"""
+        response = await client.request(method, url)
+        assert response.status_code == expected_status
         
         data = response.json()
-        assert data["detail"] == "Student is not signed up for this activity"
+        assert data["detail"] == expected_detail
+
+
+class TestBulkEndpoint:
+    """Tests for POST /activities/bulk endpoint"""
     
-    def test_unregister_nonexistent_activity(self, client):
-        """Test unregister fails for non-existent activity"""
-        response = client.delete(
-            "/activities/Nonexistent Club/unregister?email=student@mergington.edu"
-        )
-        assert response.status_code == status.HTTP_404_NOT_FOUND
+    async def test_bulk_applies_all_operations(self, client, activities_state):
+        """Test that a bulk request applies every signup and unregistration"""
+        email = "multisport@mergington.edu"
+        response = await client.post("/activities/bulk", json=[
+            {"activity": "Chess Club", "email": email, "op": "signup"},
+            {"activity": "Soccer Team", "email": email, "op": "signup"},
+            {"activity": "Chess Club", "email": "michael@mergington.edu", "op": "unregister"},
+        ])
+        assert response.status_code == 200
+        
+        data = response.json()
+        assert data["applied"] == 3
+        
+        assert email in activities_state["Chess Club"]["participants"]
+        assert email in activities_state["Soccer Team"]["participants"]
+        assert "michael@mergington.edu" not in activities_state["Chess Club"]["participants"]
+    
+    async def test_bulk_failure_rolls_back(self, client, activities_state):
+        """Test that a failing operation undoes the ones before it"""
+        email = "rollback@mergington.edu"
+        response = await client.post("/activities/bulk", json=[
+            {"activity": "Chess Club", "email": email, "op": "signup"},
+            {"activity": "Chess Club", "email": "daniel@mergington.edu", "op": "unregister"},
+            {"activity": "Nonexistent Club", "email": email, "op": "signup"},
+        ])
+        assert response.status_code == 404
         
         data = response.json()
         assert data["detail"] == "Activity not found"
+        
+        assert email not in activities_state["Chess Club"]["participants"]
+        assert "daniel@mergington.edu" in activities_state["Chess Club"]["participants"]
     
-    def test_unregister_with_url_encoded_activity_name(self, client):
-        """Test unregister works with URL-encoded activity names"""
-        response = client.delete(
-            "/activities/Programming%20Class/unregister?email=emma@mergington.edu"
-        )
-        assert response.status_code == status.HTTP_200_OK
+    async def test_bulk_rollback_with_concurrent_unregister(self, client, activities_state):
+        """Test that a concurrent unregister cannot interleave with a rolled-back batch"""
+        email = "racer@mergington.edu"
+        bulk = client.post("/activities/bulk", json=[
+            {"activity": "Chess Club", "email": email, "op": "signup"},
+            {"activity": "Nonexistent Club", "email": email, "op": "signup"},
+        ])
+        unregister = client.delete(UNREGISTER.format(activity="Chess Club"), params={"email": email})
         
-        # Verify participant was removed
-        activities_response = client.get("/activities")
-        activities_data = activities_response.json()
-        assert "emma@mergington.edu" not in activities_data["Programming Class"]["participants"]
+        bulk_response, unregister_response = await asyncio.gather(bulk, unregister)
+        assert bulk_response.status_code == 404
+        # The unregister ran before or after the whole batch, never in the middle
+        assert unregister_response.status_code == 400
+        assert email not in activities_state["Chess Club"]["participants"]
+    
+    async def test_bulk_rejects_unknown_operation(self, client):
+        """Test that an unsupported op is rejected by validation"""
+        response = await client.post("/activities/bulk", json=[
+            {"activity": "Chess Club", "email": "x@mergington.edu", "op": "promote"},
+        ])
+        assert response.status_code == 422
 
 
 class TestSignupAndUnregisterFlow:
     """Integration tests for signup and unregister workflows"""
     
-    def test_complete_signup_unregister_flow(self, client):
+    async def test_complete_signup_unregister_flow(self, client, activities_state):
         """Test complete flow: signup -> verify -> unregister -> verify"""
         email = "flowtest@mergington.edu"
         activity = "Chess Club"
         
         # Initial state - participant not in activity
-        response = client.get("/activities")
-        assert email not in response.json()[activity]["participants"]
+        assert email not in activities_state[activity]["participants"]
         
         # Sign up
-        signup_response = client.post(f"/activities/{activity}/signup?email={email}")
-        assert signup_response.status_code == status.HTTP_200_OK
+        signup_response = await client.post(SIGNUP.format(activity=activity), params={"email": email})
+        assert signup_response.status_code == 200
         
         # Verify signup
-        response = client.get("/activities")
-        assert email in response.json()[activity]["participants"]
+        assert email in activities_state[activity]["participants"]
         
         # Unregister
-        unregister_response = client.delete(f"/activities/{activity}/unregister?email={email}")
-        assert unregister_response.status_code == status.HTTP_200_OK
+        unregister_response = await client.delete(UNREGISTER.format(activity=activity), params={"email": email})
+        assert unregister_response.status_code == 200
         
         # Verify unregister
-        response = client.get("/activities")
-        assert email not in response.json()[activity]["participants"]
-    
-    def test_cannot_signup_twice(self, client):
-        """Test that signing up twice for same activity fails"""
-        email = "duplicate@mergington.edu"
-        activity = "Soccer Team"
-        
-        # First signup succeeds
-        response1 = client.post(f"/activities/{activity}/signup?email={email}")
-        assert response1.status_code == status.HTTP_200_OK
-        
-        # Second signup fails
-        response2 = client.post(f"/activities/{activity}/signup?email={email}")
-        assert response2.status_code == status.HTTP_400_BAD_REQUEST
-        assert "already signed up" in response2.json()["detail"]
+        assert email not in activities_state[activity]["participants"]
     
-    def test_cannot_unregister_twice(self, client):
-        """Test that unregistering twice fails"""
+    async def test_signup_unregister_state_machine(self, client, activities_state):
+        """Test duplicate signup/unregister fail and re-signup works after unregistering"""
         email = "michael@mergington.edu"
         activity = "Chess Club"
+        signup_url = SIGNUP.format(activity=activity)
+        unregister_url = UNREGISTER.format(activity=activity)
+        
+        # Signing up while registered fails (michael is initially registered)
+        response = await client.post(signup_url, params={"email": email})
+        assert response.status_code == 400
+        
+        data = response.json()
+        assert "already signed up" in data["detail"]
         
         # First unregister succeeds
-        response1 = client.delete(f"/activities/{activity}/unregister?email={email}")
-        assert response1.status_code == status.HTTP_200_OK
+        response = await client.delete(unregister_url, params={"email": email})
+        assert response.status_code == 200
+        assert email not in activities_state[activity]["participants"]
         
         # Second unregister fails
-        response2 = client.delete(f"/activities/{activity}/unregister?email={email}")
-        assert response2.status_code == status.HTTP_400_BAD_REQUEST
-        assert "not signed up" in response2.json()["detail"]
+        response = await client.delete(unregister_url, params={"email": email})
+        assert response.status_code == 400
+        
+        data = response.json()
+        assert "not signed up" in data["detail"]
+        
+        # Sign up again after unregistering
+        response = await client.post(signup_url, params={"email": email})
+        assert response.status_code == 200
+        assert email in activities_state[activity]["participants"]
+        
+        # Second signup fails
+        response = await client.post(signup_url, params={"email": email})
+        assert response.status_code == 400
+        
+        data = response.json()
+        assert "already signed up" in data["detail"]
     
-    def test_signup_after_unregister(self, client):
-        """Test that a user can sign up again after unregistering"""
-        email = "michael@mergington.edu"
-        activity = "Chess Club"
+    async def test_concurrent_signups_and_reads(self, client, fetch_activities, activities_state):
+        """Test that overlapping signups, unregistrations and reads all succeed"""
+        emails = [f"student{i}@mergington.edu" for i in range(20)]
+        requests = [
+            client.post(SIGNUP.format(activity="Chess Club"), params={"email": email})
+            for email in emails
+        ]
+        requests.append(client.delete(
+            UNREGISTER.format(activity="Chess Club"), params={"email": "michael@mergington.edu"}
+        ))
+        requests += [fetch_activities() for _ in range(20)]
         
-        # Unregister (michael is initially registered)
-        response1 = client.delete(f"/activities/{activity}/unregister?email={email}")
-        assert response1.status_code == status.HTTP_200_OK
+        responses = await asyncio.gather(*requests)
+        assert all(response.status_code == 200 for response in responses)
         
-        # Sign up again
-        response2 = client.post(f"/activities/{activity}/signup?email={email}")
-        assert response2.status_code == status.HTTP_200_OK
+        participants = activities_state["Chess Club"]["participants"]
+        assert set(emails) <= participants
+        assert "michael@mergington.edu" not in participants
         
-        # Verify user is registered
-        activities_response = client.get("/activities")
-        assert email in activities_response.json()[activity]["participants"]
+        response = await fetch_activities()
+        data = response.json()
+        assert data["Chess Club"]["participants"] == sorted(participants)